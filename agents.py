@@ -1,30 +1,93 @@
 import os
+import stat
+import re
+import json
+import string
 import asyncio
-import markdown
-from data_scrapers import get_treasury_yield, assess_yield_curve, get_stock_quotes
+import httpx
+import tempfile
+import bleach
+from data_scrapers import get_market_data_async, get_stock_quotes_async
 from llama_index.llms.openai import OpenAI
-from llama_index.core.workflow import Context
+from llama_index.core.workflow import Context, Event, StopEvent
 from tavily import AsyncTavilyClient
 from dotenv import load_dotenv
 from llama_index.core.agent.workflow import FunctionAgent, AgentWorkflow, AgentOutput, ToolCallResult, ToolCall
 
 load_dotenv()
 
+# Shared HTTP connection pool so LLM calls reuse connections across agent hops
+http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=50, max_keepalive_connections=20))
+
+# Cap concurrent LLM calls so simultaneous report runs don't trip OpenAI rate limits
+llm_semaphore = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "4")))
+
+
+async def _bounded_stream(start_stream, *args, **kwargs):
+    """
+    Hold llm_semaphore from the start of a streamed LLM response until it is exhausted or closed.
+    """
+    async with llm_semaphore:
+        async for chunk in await start_stream(*args, **kwargs):
+            yield chunk
+
+
+class BoundedOpenAI(OpenAI):
+    """
+    OpenAI LLM whose async calls all go through llm_semaphore, including the agents' own
+    tool-selection and handoff calls.
+    """
+
+    async def achat(self, *args, **kwargs):
+        async with llm_semaphore:
+            return await super().achat(*args, **kwargs)
+
+    async def acomplete(self, *args, **kwargs):
+        async with llm_semaphore:
+            return await super().acomplete(*args, **kwargs)
+
+    async def astream_chat(self, *args, **kwargs):
+        return _bounded_stream(super().astream_chat, *args, **kwargs)
+
+    async def astream_complete(self, *args, **kwargs):
+        return _bounded_stream(super().astream_complete, *args, **kwargs)
+
+
 # Initialize LLM (Using OpenAI, but can be changed)
-llm = OpenAI(model="gpt-4o-mini", api_key=os.getenv("OPENAI_API_KEY"))
+llm = BoundedOpenAI(model="gpt-4o-mini", api_key=os.getenv("OPENAI_API_KEY"), async_http_client=http_client)
 
+# Initialize the news search client once and reuse it for every search
+tavily_client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
 
-async def fetch_market_news(ctx: Context, query: str) -> str:
+report_path = os.getenv("REPORT_PATH")
+# Normalize Windows-style paths
+if report_path:
+    report_path = os.path.normpath(report_path)
+
+# Extra searches run alongside the agent's own query for broader news coverage
+NEWS_QUERIES = ["US treasury yields", "S&P 500 market news", "corporate credit spreads"]
+
+
+class TokenEvent(Event):
+    """A single LLM token, streamed while a tool is still generating its response."""
+    token: str
+
+
+async def _stream_completion(ctx: Context, prompt: str) -> str:
     """
-    Fetch and summarize key market news.
+    Stream an LLM completion, forwarding each token to the workflow event stream.
     """
-    client = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
-    search_results = await client.search(query)
+    text = ""
+    async for chunk in await llm.astream_complete(prompt):
+        token = chunk.delta or ""
+        ctx.write_event_to_stream(TokenEvent(token=token))
+        text += token
+    return text
 
-    # Summarizing News Before Returning
-    summary_prompt = f"""
+
+NEWS_SUMMARY_TEMPLATE = string.Template("""
     Below is a list of recent news headlines and summaries:
-    {search_results}
+    $search_results
 
     Extract key **themes and trends** that will impact **interest rates, Treasury yields, and credit markets**.
     - Do not list individual headlines.
@@ -32,13 +95,56 @@ async def fetch_market_news(ctx: Context, query: str) -> str:
     - Identify risks and potential opportunities for fixed-income traders.
     
     Respond with a **short 3-paragraph summary** of the key takeaways.
-    """
+    Respond in minimal valid HTML (h2, h3, p, ul, li, strong and table tags only), with no <html>/<body> tags, Markdown or code fences.
+    """)
 
-    news_summary = llm.complete(summary_prompt).text
+
+async def fetch_market_news(ctx: Context, query: str) -> str:
+    """
+    Fetch and summarize key market news.
+    """
+    # Prefetch market data for the ForecastAgent while the news is searched and summarized
+    market_data = asyncio.create_task(get_market_data_async())
+    try:
+        # Run all searches concurrently and merge the results of those that succeed
+        queries = [query, *NEWS_QUERIES]
+        responses = await asyncio.gather(*(tavily_client.search(q) for q in queries), return_exceptions=True)
+        for q, response in zip(queries, responses):
+            if isinstance(response, Exception):
+                print(f"❌ ERROR searching news for '{q}': {response}")
+        successful = [response for response in responses if not isinstance(response, Exception)]
+        if not successful:
+            raise responses[0]
+        # The same article can come back from several queries, so keep the first copy per URL
+        search_results, seen_urls = [], set()
+        for response in successful:
+            for result in response.get("results", []):
+                url = result.get("url")
+                if url in seen_urls:
+                    continue
+                if url:
+                    seen_urls.add(url)
+                search_results.append(result)
+
+        # Summarizing News Before Returning
+        summary_prompt = NEWS_SUMMARY_TEMPLATE.substitute(search_results=search_results)
+
+        news_summary = await _stream_completion(ctx, summary_prompt)
+    except BaseException:
+        # Don't leave the prefetch running, or its error unretrieved, if the search or summary failed
+        market_data.cancel()
+        if market_data.done() and not market_data.cancelled():
+            market_data.exception()
+        raise
     
     # Store current state
     current_state = await ctx.get("state")
     current_state["research_notes"] = news_summary
+    try:
+        current_state["market_data"] = await market_data
+    except Exception as e:
+        # Leave market_data unset so the ForecastAgent fetches it again
+        print(f"❌ ERROR prefetching market data: {e}")
     await ctx.set("state", current_state)
     
     print("🔀 Handoff from NewsAgent to ForecastAgent")  # Debugging
@@ -46,54 +152,22 @@ async def fetch_market_news(ctx: Context, query: str) -> str:
     return "News summary generated."
 
 
-async def predict_market_trends(ctx: Context) -> str:
-    """
-    Analyze recent trends and provide a fixed-income forecast for traders.
-    """
-    current_state = await ctx.get("state")
-    news_data = current_state.get("research_notes", '')
-
-    if not news_data:
-        print("❌ No research_notes found! Skipping ForecastAgent")
-        return "No data available to generate forecast."
-    
-    # get 10-year treasury yield
-    treasury_yield = get_treasury_yield()
-    
-    # assess yield curve
-    spread, curve_status = assess_yield_curve()
-
-    # fetch stock quotes desired in report
-    stock_quotes = get_stock_quotes()
-    sp = stock_quotes['S&P 500']['price']
-    sp_change = stock_quotes['S&P 500']['change']
-    sp_change_pct = stock_quotes['S&P 500']['change_pct']
-
-    dow = stock_quotes['Dow Jones']['price']
-    dow_change = stock_quotes['Dow Jones']['change']
-    dow_change_pct = stock_quotes['Dow Jones']['change_pct']
-
-    nasdaq = stock_quotes['Nasdaq']['price']
-    nasdaq_change = stock_quotes['Nasdaq']['change']
-    nasdaq_change_pct = stock_quotes['Nasdaq']['change_pct']
-
-    # LLM prompt with real market data
-    prompt = f"""
+FORECAST_TEMPLATE = string.Template("""
     You are a financial analyst specializing in macroeconomics, fixed income, and equity markets. 
     Analyze the following real-time market data and predict how these factors will influence short-term trends in both fixed-income and equity markets.
 
     ## 📉 Market Data:
-    - **10-Year Treasury Yield**: {treasury_yield:.2f}%
-    - **Yield Curve Status**: {curve_status} (Spread: {spread:.2f}%)
+    - **10-Year Treasury Yield**: ${treasury_yield}%
+    - **Yield Curve Status**: ${curve_status} (Spread: ${spread}%)
 
     ## 📈 Stock Market Performance:
     Below is a summary of major US indices, including daily changes in dollar amount and percentage:
 
-    | Index         | Price   | Change ($) | Change (%) |
+    | Index         | Price   | Change ($$) | Change (%) |
     |--------------|---------|-----------|-----------|
-    | **S&P 500**  | {sp}  | {sp_change}  | {sp_change_pct}%  |
-    | **Dow Jones**| {dow}  | {dow_change}  | {dow_change_pct}%  |
-    | **Nasdaq**   | {nasdaq}  | {nasdaq_change}  | {nasdaq_change_pct}%  |
+    | **S&P 500**  | ${sp}  | ${sp_change}  | ${sp_change_pct}%  |
+    | **Dow Jones**| ${dow}  | ${dow_change}  | ${dow_change_pct}%  |
+    | **Nasdaq**   | ${nasdaq}  | ${nasdaq_change}  | ${nasdaq_change_pct}%  |
 
     ##  **Your Task:**
     ### **Fixed-Income Analysis**
@@ -132,12 +206,59 @@ async def predict_market_trends(ctx: Context) -> str:
     - Are there opportunities in **sector rotation**, **hedging**, or **alternative assets**?  
     
     Respond with a structured analysis and **clear, actionable strategies** for both fixed-income and equity market participants.
+    Respond in minimal valid HTML (h2, h3, p, ul, li, strong and table tags only), with no <html>/<body> tags, Markdown or code fences.
+    """)
+
+
+async def predict_market_trends(ctx: Context) -> str:
     """
+    Analyze recent trends and provide a fixed-income forecast for traders.
+    """
+    current_state = await ctx.get("state")
+    news_data = current_state.get("research_notes", '')
+
+    if not news_data:
+        print("❌ No research_notes found! Skipping ForecastAgent")
+        return "No data available to generate forecast."
+    
+    # 10-year treasury yield, yield curve and stock quotes prefetched by the NewsAgent
+    market_data = current_state.get("market_data") or await get_market_data_async()
+    treasury_yield = market_data["treasury_yield"]
+    spread, curve_status = market_data["spread"], market_data["curve_status"]
+    stock_quotes = market_data["stock_quotes"]
+    sp = stock_quotes['S&P 500']['price']
+    sp_change = stock_quotes['S&P 500']['change']
+    sp_change_pct = stock_quotes['S&P 500']['change_pct']
+
+    dow = stock_quotes['Dow Jones']['price']
+    dow_change = stock_quotes['Dow Jones']['change']
+    dow_change_pct = stock_quotes['Dow Jones']['change_pct']
+
+    nasdaq = stock_quotes['Nasdaq']['price']
+    nasdaq_change = stock_quotes['Nasdaq']['change']
+    nasdaq_change_pct = stock_quotes['Nasdaq']['change_pct']
+
+    # LLM prompt with real market data
+    prompt = FORECAST_TEMPLATE.substitute(
+        treasury_yield=f"{treasury_yield:.2f}",
+        spread=f"{spread:.2f}",
+        curve_status=curve_status,
+        sp=sp,
+        sp_change=sp_change,
+        sp_change_pct=sp_change_pct,
+        dow=dow,
+        dow_change=dow_change,
+        dow_change_pct=dow_change_pct,
+        nasdaq=nasdaq,
+        nasdaq_change=nasdaq_change,
+        nasdaq_change_pct=nasdaq_change_pct,
+    )
 
-    forecast = llm.complete(prompt).text
-    print("✅ Forecast Generated:", forecast)  # Debugging
+    forecast = await _stream_completion(ctx, prompt)
+    print("\n✅ Forecast Generated")  # Debugging
 
     current_state["market_forecast"] = forecast
+    current_state["stock_quotes"] = stock_quotes
     await ctx.set("state", current_state)
  
     print("🔀 Handoff from ForecastAgent to ReportAgent")  # Debugging
@@ -147,6 +268,74 @@ async def predict_market_trends(ctx: Context) -> str:
             }
 
 
+# Tags and attributes kept when sanitizing the LLM-written HTML
+ALLOWED_TAGS = {"h2", "h3", "h4", "p", "br", "hr", "ul", "ol", "li", "strong", "em", "b", "i",
+                "table", "thead", "tbody", "tr", "th", "td"}
+ALLOWED_ATTRIBUTES = {"th": ["colspan", "rowspan"], "td": ["colspan", "rowspan"]}
+
+
+def _strip_code_fence(text):
+    """
+    Remove one leading ```html (or bare ```) fence and one trailing ``` fence, which the LLM often adds.
+    """
+    text = re.sub(r"^\s*```[\w-]*[ \t]*\n?", "", text, count=1)
+    return re.sub(r"\n?```\s*$", "", text, count=1)
+
+
+# Report HTML shell is built once and reused for every report
+REPORT_TEMPLATE = string.Template("""<!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Market Report</title>
+        <style>
+            body { font-family: Arial, sans-serif; line-height: 1.6; max-width: 900px; margin: auto; padding: 20px; }
+            h1, h2, h3 { color: #333; border-bottom: 2px solid #ddd; padding-bottom: 5px; }
+            p, li { color: #555; }
+            ul { padding-left: 25px; list-style-type: disc; }  /* Circular bullets */
+            strong { font-weight: bold; }
+            hr { margin: 20px 0; border: 0; border-top: 1px solid #ccc; }
+            .footer { text-align: center; font-size: 0.8em; margin-top: 30px; color: #777; }
+            table { width: 100%; border-collapse: collapse; text-align: center; }
+            th, td { border: 1px solid #ddd; padding: 8px; }
+            th { background-color: #f4f4f4; }
+        </style>
+    </head>
+    <body>
+        <div>$html_content</div>
+        $stock_table  <!-- Inject HTML table here -->
+        <p class="footer"><strong>Generated by AI Research Agents</strong></p>
+    </body>
+    </html>""")
+
+
+# os.umask can only be read by setting it, so read it once at import rather than from worker threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _write_report(path, html):
+    """
+    Write the report to a temp file beside `path` and move it into place,
+    so the server never serves a half-written report.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(html)
+        # mkstemp creates owner-only files; keep the existing report's mode, or what open() would give a new file
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 async def format_report(ctx: Context, report_content: str) -> str:
     """
     Formats the report into a structured HTML document and saves it.
@@ -156,8 +345,8 @@ async def format_report(ctx: Context, report_content: str) -> str:
     research_notes = state.get("research_notes", "No research notes available.")
     market_forecast = state.get("market_forecast", "Market forecast not generated.")
 
-    # Fetch stock quotes with latest prices, changes, and percentage changes
-    stock_quotes = get_stock_quotes()
+    # Reuse stock quotes fetched by the ForecastAgent, only fetching them if missing
+    stock_quotes = state.get("stock_quotes") or await get_stock_quotes_async()
 
     # Function to format price changes with color coding
     def format_change(change, change_pct):
@@ -170,6 +359,8 @@ async def format_report(ctx: Context, report_content: str) -> str:
         else:
             return f'<span style="color:black;">{change} ({change_pct}%)</span>'
 
+    sp, dow, nasdaq = stock_quotes["S&P 500"], stock_quotes["Dow Jones"], stock_quotes["Nasdaq"]
+
     # Construct HTML table for stock quotes (kept as pure HTML)
     stock_table = f"""
     <h2>📉 Stock Market Overview</h2>
@@ -182,78 +373,47 @@ async def format_report(ctx: Context, report_content: str) -> str:
         </tr>
         <tr>
             <td><b>S&P 500</b></td>
-            <td>{stock_quotes["S&P 500"]["price"]}</td>
-            <td>{stock_quotes["S&P 500"]["prev_close"]}</td>
-            <td>{format_change(stock_quotes["S&P 500"]["change"], stock_quotes["S&P 500"]["change_pct"])}</td>
+            <td>{sp["price"]}</td>
+            <td>{sp["prev_close"]}</td>
+            <td>{format_change(sp["change"], sp["change_pct"])}</td>
         </tr>
         <tr>
             <td><b>Dow Jones</b></td>
-            <td>{stock_quotes["Dow Jones"]["price"]}</td>
-            <td>{stock_quotes["Dow Jones"]["prev_close"]}</td>
-            <td>{format_change(stock_quotes["Dow Jones"]["change"], stock_quotes["Dow Jones"]["change_pct"])}</td>
+            <td>{dow["price"]}</td>
+            <td>{dow["prev_close"]}</td>
+            <td>{format_change(dow["change"], dow["change_pct"])}</td>
         </tr>
         <tr>
             <td><b>Nasdaq</b></td>
-            <td>{stock_quotes["Nasdaq"]["price"]}</td>
-            <td>{stock_quotes["Nasdaq"]["prev_close"]}</td>
-            <td>{format_change(stock_quotes["Nasdaq"]["change"], stock_quotes["Nasdaq"]["change_pct"])}</td>
+            <td>{nasdaq["price"]}</td>
+            <td>{nasdaq["prev_close"]}</td>
+            <td>{format_change(nasdaq["change"], nasdaq["change_pct"])}</td>
         </tr>
     </table>
     """
 
-    # generate markdown content ** without including the table in markdown conversion **
-    markdown_content = f"""
-# 📊 US Equity & Fixed Income Market Report
-
-## 📰 Key Market News  
-{research_notes}
+    # The LLM writes HTML directly, so sanitize it instead of converting Markdown
+    llm_html = bleach.clean(
+        _strip_code_fence(research_notes) + _strip_code_fence(market_forecast),
+        tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, strip=True
+    )
+    html_content = f"""
+<h1>📊 US Equity & Fixed Income Market Report</h1>
 
-{market_forecast}
-  
+<h2>📰 Key Market News</h2>
+{llm_html}
 """
 
-    # Convert Markdown to HTML for non-table content
-    html_content = markdown.markdown(markdown_content, extensions=["extra"])
+    # Combine the report HTML **with the raw HTML stock table**
+    final_html = REPORT_TEMPLATE.substitute(html_content=html_content, stock_table=stock_table)
 
-    # Combine Markdown-rendered HTML **with the raw HTML stock table**  
-    final_html = f"""<!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Market Report</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; max-width: 900px; margin: auto; padding: 20px; }}
-            h1, h2, h3 {{ color: #333; border-bottom: 2px solid #ddd; padding-bottom: 5px; }}
-            p, li {{ color: #555; }}
-            ul {{ padding-left: 25px; list-style-type: disc; }}  /* Circular bullets */
-            strong {{ font-weight: bold; }}
-            hr {{ margin: 20px 0; border: 0; border-top: 1px solid #ccc; }}
-            .footer {{ text-align: center; font-size: 0.8em; margin-top: 30px; color: #777; }}
-            table {{ width: 100%; border-collapse: collapse; text-align: center; }}
-            th, td {{ border: 1px solid #ddd; padding: 8px; }}
-            th {{ background-color: #f4f4f4; }}
-        </style>
-    </head>
-    <body>
-        <div>{html_content}</div>
-        {stock_table}  <!-- Inject HTML table here -->
-        <p class="footer"><strong>Generated by AI Research Agents</strong></p>
-    </body>
-    </html>"""
-
-    report_path = os.getenv("REPORT_PATH")
     if not report_path:
         print("❌ ERROR: REPORT_PATH not set in .env file!")
         return "Failed to save report. REPORT_PATH missing."
 
-    # Normalize Windows-style paths
-    report_path = os.path.normpath(report_path)
-
     try:
-        # Save the properly formatted HTML file
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write(final_html)
+        # Save the properly formatted HTML file without blocking the event loop
+        await asyncio.to_thread(_write_report, report_path, final_html)
 
         state["final_report"] = final_html
         await ctx.set("state", state)
@@ -288,7 +448,7 @@ forecast_agent = FunctionAgent(
 report_agent = FunctionAgent(
     name="ReportAgent",
     description="Formats and exports the final report.",
-    system_prompt="Format the final market analysis report into Markdown.",
+    system_prompt="Format the final market analysis report into HTML.",
     llm=llm,
     tools=[format_report],
     can_handoff_to=[]
@@ -301,51 +461,109 @@ agent_workflow = AgentWorkflow(
         "research_notes": "",
         "market_forecast": "Not generated yet.",
         "final_report": "Not written yet.",
+        "market_data": {},
+        "stock_quotes": {},
     }
 )
 
 
+REPORT_REQUEST = "Fetch the latest US equity and treasury market news and generate a forecast report including current day quotes for the DOW, S and P 500, and NASDAQ."
+
+
 async def main():
-    handler = agent_workflow.run(
-        user_msg="Fetch the latest US equity and treasury market news and generate a forecast report including current day quotes for the DOW, S and P 500, and NASDAQ."
-    )
-    await process_events(handler)
+    handler = agent_workflow.run(user_msg=REPORT_REQUEST)
+    await print_events(handler)
 
 
-async def process_events(handler):
+async def iter_events(handler):
+    """
+    Yield workflow events as JSON-serializable dicts, tagged with a "type".
+    The stream ends with a {"type": "done"} event; if the consumer stops before that
+    (e.g. an SSE client disconnects), the run is cancelled rather than left running.
+    """
     current_agent = None
+    finished = False
     
-    async for event in handler.stream_events():
-        if (
-            hasattr(event, "current_agent_name")
-            and event.current_agent_name != current_agent
-        ):
-            current_agent = event.current_agent_name
+    try:
+        async for event in handler.stream_events():
+            if isinstance(event, StopEvent):
+                finished = True
+                yield {"type": "done"}
+                continue
+
+            if isinstance(event, TokenEvent):
+                yield {"type": "token", "token": event.token}
+                continue
+
+            if (
+                hasattr(event, "current_agent_name")
+                and event.current_agent_name != current_agent
+            ):
+                current_agent = event.current_agent_name
+                yield {"type": "agent", "agent": current_agent}
+
+            if isinstance(event, AgentOutput):
+                yield {
+                    "type": "output",
+                    "content": event.response.content,
+                    "tool_calls": [call.tool_name for call in event.tool_calls],
+                }
+
+            elif isinstance(event, ToolCallResult):
+                yield {
+                    "type": "tool_result",
+                    "tool_name": event.tool_name,
+                    "tool_kwargs": event.tool_kwargs,
+                    "tool_output": str(event.tool_output),
+                }
+
+            elif isinstance(event, ToolCall):
+                yield {"type": "tool_call", "tool_name": event.tool_name, "tool_kwargs": event.tool_kwargs}
+
+            # ✅ **Track handoff attempts explicitly**
+            elif hasattr(event, "handoff_to_agent"):
+                yield {"type": "handoff", "agent": event.handoff_to_agent}
+    finally:
+        if not finished and not handler.done():
+            # Shielded so the cancel still goes through when this task is itself being cancelled
+            await asyncio.shield(handler.cancel_run())
+
+
+async def iter_sse(handler):
+    """
+    Yield workflow events framed as Server-Sent Events.
+    """
+    async for event in iter_events(handler):
+        yield f"data: {json.dumps(event, default=str)}\n\n"
+
+
+async def print_events(handler):
+    async for event in iter_events(handler):
+        if event["type"] == "token":
+            print(event["token"], end="", flush=True)
+
+        elif event["type"] == "agent":
             print(f"\n{'='*50}")
-            print(f"🤖 Agent: {current_agent} is now active")
+            print(f"🤖 Agent: {event['agent']} is now active")
             print(f"{'='*50}\n")
 
-        if isinstance(event, AgentOutput):
-            if event.response.content:
-                print("📤 Output:", event.response.content)
-            if event.tool_calls:
-                print(
-                    "🛠️  Planning to use tools:",
-                    [call.tool_name for call in event.tool_calls],
-                )
-
-        elif isinstance(event, ToolCallResult):
-            print(f"🔧 Tool Result ({event.tool_name}):")
-            print(f"  Arguments: {event.tool_kwargs}")
-            print(f"  Output: {event.tool_output}")
-
-        elif isinstance(event, ToolCall):
-            print(f"🔨 Calling Tool: {event.tool_name}")
-            print(f"  With arguments: {event.tool_kwargs}")
-
-        # ✅ **Track handoff attempts explicitly**
-        elif hasattr(event, "handoff_to_agent"):
-            print(f"🚀 Handoff triggered to: {event.handoff_to_agent}")
+        elif event["type"] == "output":
+            if event["content"]:
+                print("📤 Output:", event["content"])
+            if event["tool_calls"]:
+                print("🛠️  Planning to use tools:", event["tool_calls"])
+
+        elif event["type"] == "tool_result":
+            print(f"🔧 Tool Result ({event['tool_name']}):")
+            print(f"  Arguments: {event['tool_kwargs']}")
+            print(f"  Output: {event['tool_output']}")
+
+        elif event["type"] == "tool_call":
+            print(f"🔨 Calling Tool: {event['tool_name']}")
+            print(f"  With arguments: {event['tool_kwargs']}")
+
+        elif event["type"] == "handoff":
+            print(f"🚀 Handoff triggered to: {event['agent']}")
 
 
 if __name__ == "__main__":
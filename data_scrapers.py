@@ -1,54 +1,150 @@
+import time
+import asyncio
+import threading
 import yfinance as yf
-import requests
-from datetime import datetime, timedelta
 
+try:
+    # Drop-in yfinance wrapper with a persistent, market-hours aware cache
+    import yfinance_cache as yfc
+except ImportError:
+    yfc = None
 
-def get_treasury_yield():
-    bond = yf.Ticker("^TNX")  # 10-Year Treasury Yield Index
-    return bond.history(period="1d")["Close"].iloc[-1]
+# In-process caches so repeated lookups within a report run (and warm reruns) skip the network
+_ticker_cache = {}   # symbol -> yfc.Ticker (or yf.Ticker without yfinance-cache)
+_history_cache = {}  # (symbol or symbols tuple, period) -> (fetched_at, DataFrame)
+_fetch_locks = {}    # cache key -> threading.Lock, so concurrent misses on a key fetch only once
 
+# yf.download keeps per-call results in module-global state, so concurrent calls can clobber each other
+_download_lock = threading.Lock()
 
-def assess_yield_curve():
+
+def _get_ticker(symbol):
+    if symbol not in _ticker_cache:
+        _ticker_cache[symbol] = (yfc or yf).Ticker(symbol)
+    return _ticker_cache[symbol]
+
+
+def _fetch_history(symbol, period):
+    """
+    Fetch Ticker.history, falling back to plain yfinance if yfinance-cache fails.
+    """
+    if yfc is None:
+        return _get_ticker(symbol).history(period=period)
+
+    try:
+        df = _get_ticker(symbol).history(period=period)
+        if df is not None:
+            return df
+        print(f"⚠️ yfinance-cache returned no data for {symbol}. Falling back to yfinance.")
+    except Exception as e:
+        print(f"⚠️ yfinance-cache failed for {symbol}: {e}. Falling back to yfinance.")
+    return yf.Ticker(symbol).history(period=period)
+
+
+def _cached(key, fetch, ttl=60):
+    """
+    Return the cached result for `key` if younger than `ttl` seconds, otherwise call `fetch` and cache it.
+    Concurrent misses on the same key wait for a single fetch instead of each hitting Yahoo.
+    """
+    def lookup():
+        entry = _history_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+    df = lookup()
+    if df is not None:
+        return df
+
+    with _fetch_locks.setdefault(key, threading.Lock()):
+        # Another thread may have fetched it while we waited for the lock
+        df = lookup()
+        if df is not None:
+            return df
+
+        df = fetch()
+        # yfinance reports failures as an empty frame, so only cache results that have data
+        if not df.empty:
+            _history_cache[key] = (time.monotonic(), df)
+        return df
+
+
+def _cached_history(symbol, period, ttl=60):
+    """
+    Return Ticker.history for `symbol`, reusing a cached result younger than `ttl` seconds.
+    """
+    return _cached((symbol, period), lambda: _fetch_history(symbol, period), ttl)
+
+
+def _download(symbols, period):
+    with _download_lock:
+        return yf.download(symbols, period=period, group_by="ticker", threads=True, progress=False)
+
+
+def _cached_download(symbols, period, ttl=60):
+    """
+    Return history for all `symbols` from a single yf.download request, grouped by ticker and cached like _cached_history.
+    """
+    return _cached(
+        (tuple(symbols), period),
+        lambda: _download(list(symbols), period),
+        ttl,
+    )
+
+
+def _last_close(symbol):
+    """
+    Fetch the latest close for a single ticker (blocking).
+    """
+    return _cached_history(symbol, "1d")["Close"].iloc[-1]
+
+
+async def get_treasury_yield_async():
+    return await asyncio.to_thread(_last_close, "^TNX")  # 10-Year Treasury Yield Index
+
+
+async def assess_yield_curve_async(ten_year=None):
     """
     Check yield curve inversion (10Y - 2Y spread)
+    Pass an already running 10Y yield task as `ten_year` to avoid fetching ^TNX twice.
     """
-    ten_year = yf.Ticker("^TNX").history(period="1d")["Close"].iloc[-1]
-    two_year = yf.Ticker("^IRX").history(period="1d")["Close"].iloc[-1]
+    if ten_year is None:
+        ten_year = get_treasury_yield_async()
+    ten_year, two_year = await asyncio.gather(ten_year, asyncio.to_thread(_last_close, "^IRX"))
     spread = ten_year - two_year
     return spread, "Inverted" if spread < 0 else "Normal"
 
 
-def get_stock_quotes():
+_UNAVAILABLE_QUOTE = {"price": "N/A", "prev_close": "N/A", "change": "N/A", "change_pct": "N/A"}
+
+
+def _fetch_quotes(tickers):
     """
-    Fetch latest stock quotes including daily price changes and percentage changes using Yahoo Finance API.
+    Fetch the latest quotes for all tickers with a single download (blocking).
     """
-    tickers = {
-        "S&P 500": "^GSPC",
-        "Dow Jones": "^DJI",
-        "Nasdaq": "^IXIC"
-    }
-    
+    try:
+        # Fetch latest market data
+        hist = _cached_download(tickers.values(), "2d")  # Get last 2 days to ensure previous close is available
+    except Exception as e:
+        print(f"❌ ERROR fetching stock quotes: {e}")
+        return {name: dict(_UNAVAILABLE_QUOTE) for name in tickers}
+
     stock_data = {}
 
     for name, symbol in tickers.items():
         try:
-            stock = yf.Ticker(symbol)
-            today = datetime.today().strftime('%Y-%m-%d')
+            closes = hist[symbol]["Close"].dropna()
 
-            # Fetch latest market data
-            hist = stock.history(period="2d")  # Get last 2 days to ensure previous close is available
-
-            if len(hist) < 2:  # Ensure we have at least two days of data
+            if len(closes) < 2:  # Ensure we have at least two days of data
                 print(f"⚠️ Not enough data for {name}. Using available data.")
-                last_price = hist["Close"].iloc[-1]
+                last_price = closes.iloc[-1]
                 prev_close = last_price
             else:
-                last_price = hist["Close"].iloc[-1]  # Latest close
-                prev_close = hist["Close"].iloc[-2]  # Previous close
+                last_price = closes.iloc[-1]  # Latest close
+                prev_close = closes.iloc[-2]  # Previous close
 
             change = last_price - prev_close
             change_pct = (change / prev_close) * 100
-            
+
             stock_data[name] = {
                 "price": round(last_price, 2),
                 "prev_close": round(prev_close, 2),
@@ -58,11 +154,44 @@ def get_stock_quotes():
 
         except Exception as e:
             print(f"❌ ERROR fetching {name}: {e}")
-            stock_data[name] = {"price": "N/A", "prev_close": "N/A", "change": "N/A", "change_pct": "N/A"}
-    
+            stock_data[name] = dict(_UNAVAILABLE_QUOTE)
+
     return stock_data
 
 
+async def get_stock_quotes_async():
+    """
+    Fetch latest stock quotes including daily price changes and percentage changes using Yahoo Finance API.
+    All tickers are fetched in one yf.download request, run in a worker thread since yfinance is blocking.
+    """
+    tickers = {
+        "S&P 500": "^GSPC",
+        "Dow Jones": "^DJI",
+        "Nasdaq": "^IXIC"
+    }
+
+    return await asyncio.to_thread(_fetch_quotes, tickers)
+
+
+async def get_market_data_async():
+    """
+    Fetch the 10Y treasury yield, yield curve status and stock quotes concurrently.
+    The 10Y yield task is shared with the yield curve check so ^TNX is only fetched once.
+    """
+    ten_year = asyncio.create_task(get_treasury_yield_async())
+    treasury_yield, (spread, curve_status), stock_quotes = await asyncio.gather(
+        ten_year,
+        assess_yield_curve_async(ten_year),
+        get_stock_quotes_async(),
+    )
+    return {
+        "treasury_yield": treasury_yield,
+        "spread": spread,
+        "curve_status": curve_status,
+        "stock_quotes": stock_quotes
+    }
+
+
 # if __name__ == "__main__":
-#     stocks = get_stock_quotes()
-#     print(stocks)
\ No newline at end of file
+#     stocks = asyncio.run(get_stock_quotes_async())
+#     print(stocks)
@@ -1,35 +1,73 @@
 import os
-from flask import Flask, render_template_string, send_file
+import uvicorn
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import FastAPI, Request
+from fastapi.responses import Response, HTMLResponse, FileResponse, StreamingResponse
 from dotenv import load_dotenv
+from agents import agent_workflow, iter_sse, REPORT_REQUEST
 
 load_dotenv()
 
-app = Flask(__name__)
+app = FastAPI()
 
 report_path = os.getenv("REPORT_PATH")
 # paths are properly formatted
 if report_path:
     report_path = os.path.normpath(report_path)  # converts slashes automatically
     
-@app.route("/")
-def home():
-    """Serve the latest HTML report."""
+def not_modified(request, etag, mtime):
+    """Check the conditional GET headers; If-None-Match takes precedence over If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since.timestamp()
+
+    return False
+
+@app.get("/")
+async def home(request: Request):
+    """Serve the latest HTML report, answering repeat requests with 304 while it is unchanged."""
     if not os.path.exists(report_path):
-        return "<h1>No report available. Please generate one first.</h1>"
+        return HTMLResponse("<h1>No report available. Please generate one first.</h1>")
     
-    with open(report_path, encoding="utf-8") as f:
-        html_report = f.read()
+    stat = os.stat(report_path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    if not_modified(request, etag, stat.st_mtime):
+        return Response(status_code=304, headers={"ETag": etag, "Last-Modified": formatdate(stat.st_mtime, usegmt=True)})
     
-    return render_template_string(html_report)
+    # The stored report is already full HTML, so send the file as-is
+    return FileResponse(
+        report_path,
+        media_type="text/html",
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+        stat_result=stat,
+    )
+
+@app.get("/stream")
+async def stream():
+    """Generate a new report, streaming agent events and tokens as they are produced, ending with a "done" event."""
+    return StreamingResponse(
+        iter_sse(agent_workflow.run(user_msg=REPORT_REQUEST)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-@app.route("/download_pdf")
-def download_pdf():
+@app.get("/download_pdf")
+async def download_pdf():
     """Allow downloading the latest PDF report."""
     if not os.path.exists(report_path):
-        return "<h1>PDF report not found. Generate the report first.</h1>"
+        return HTMLResponse("<h1>PDF report not found. Generate the report first.</h1>")
     
-    return send_file(report_path, as_attachment=True)
+    return FileResponse(report_path, filename=os.path.basename(report_path))
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
- 
\ No newline at end of file
+    # One worker serves many concurrent requests on its event loop; uvicorn picks uvloop when installed
+    uvicorn.run("flask_api:app", host="0.0.0.0", port=5000, workers=1, loop="auto")